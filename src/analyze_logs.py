@@ -6,28 +6,87 @@ It:
 - counts HTTP status codes (e.g. 401, 429, 500)
 - counts all symbols where metrics could NOT be calculated
   (including those failing due to API errors)
+Log files are append-only, so the scan position and the results so far
+are remembered in logs/.analyze_logs.state; the next run on the same file
+only scans the newly appended part. A different, shrunk or replaced file
+starts a full scan; `python -m src.analyze_logs --full` forces one.
 """
+import argparse
 import os
-import glob
 import re
+import json
 from collections import Counter
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
 
 LOG_DIR = "logs"
-LOG_PATTERN = "etl_*.log"
+# Timestamped log files: etl_YYYYMMDD_HHMMSS.log
+LOG_PREFIX = "etl_"
+LOG_SUFFIX = ".log"
 FALLBACK_LOG_FILE = os.path.join(LOG_DIR, "etl.log")
 
-# Match our own API error log:
-API_STATUS_RE = re.compile(r"Unexpected status (\d+)\b")
+# Incremental scan state (last file, byte offset, results so far)
+STATE_FILE = os.path.join(LOG_DIR, ".analyze_logs.state")
 
-# Match HTTPError:
-HTTPERROR_RE = re.compile(r"Server Error: (\d{3})")
+# Log files are read in binary chunks of this size (64 KiB) and split into
+# lines manually; only lines that matter are decoded to str.
+READ_CHUNK_SIZE = 64 * 1024
 
-# Match our warning:
-NO_METRICS_RE = re.compile(r"No metrics could be calculated for (\S+)")
+# Patterns we care about, compiled once at import (as bytes, so lines are
+# only decoded when they are reported). Each is searched on its own and
+# only its first match per line counts, like the original per-line scan:
+# - API_STATUS_RE: our own API error log ("Unexpected status 500 ...")
+# - HTTPERROR_RE: HTTPError message ("Server Error: 500 ...")
+# - NO_METRICS_RE: our warning ("No metrics could be calculated for XYZ")
+# - SYMBOL_IN_URL_RE: symbol inside API URLs (.../financials/WDI.SW/income_statement)
+API_STATUS_RE = re.compile(rb"Unexpected status (\d+)\b")
+HTTPERROR_RE = re.compile(rb"Server Error: (\d{3})")
+NO_METRICS_RE = re.compile(rb"No metrics could be calculated for (\S+)")
+SYMBOL_IN_URL_RE = re.compile(rb"/financials/([A-Z0-9\.\-]+)/income_statement")
 
-# Match symbol inside API URLs:
-# .../financials/WDI.SW/income_statement
-SYMBOL_IN_URL_RE = re.compile(r"/financials/([A-Z0-9\.\-]+)/income_statement")
+# Cheap substring markers: a line can only contribute to the summary if it
+# contains one of them (status codes and URL symbols are only counted on
+# ERROR lines), so blocks/lines without any marker skip the regex entirely.
+ERROR_MARKER = b"ERROR"
+NO_METRICS_MARKER = b"No metrics could be calculated for"
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="replace")
+
+
+def _count_decoded(hits: list) -> Counter:
+    """Count raw byte hits, then decode each distinct key once."""
+    counts: Counter = Counter()
+    for raw, cnt in Counter(hits).items():
+        counts[_decode(raw)] += cnt
+    return counts
+
+
+def _iter_line_chunks(
+    f: BinaryIO, chunk_size: int = READ_CHUNK_SIZE
+) -> Iterator[Tuple[bytes, int]]:
+    """
+    Yield (block, consumed) pairs: blocks of complete lines (without the
+    trailing newline) read from a binary file in fixed-size chunks, and
+    the number of bytes they cover including that newline. A partial last
+    line of a chunk is carried over into the next one. A last line without
+    a trailing newline is yielded at the end with consumed=0: it may still
+    be written, so a saved scan position must stay in front of it.
+    """
+    carry = b""
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        data = carry + data
+        cut = data.rfind(b"\n")
+        if cut == -1:
+            carry = data
+            continue
+        carry = data[cut + 1:]
+        yield data[:cut], cut + 1
+    if carry:
+        yield carry, 0
 
 
 def find_latest_log_file() -> str:
@@ -37,13 +96,24 @@ def find_latest_log_file() -> str:
     largest one. Falls back to logs/etl.log if no timestamped file exists.
     Raises FileNotFoundError if nothing is found.
     """
-    pattern = os.path.join(LOG_DIR, LOG_PATTERN)
-    candidates = glob.glob(pattern)
+    # filenames are like etl_20251206_123712.log, so lexicographic max = newest.
+    # Single pass over the directory entries, no glob/fnmatch and no stat().
+    latest = None
+    try:
+        with os.scandir(LOG_DIR) as it:
+            for entry in it:
+                name = entry.name
+                if (
+                    name.startswith(LOG_PREFIX)
+                    and name.endswith(LOG_SUFFIX)
+                    and (latest is None or name > latest)
+                ):
+                    latest = name
+    except FileNotFoundError:
+        latest = None
 
-    if candidates:
-        # filenames are like etl_20251206_123712.log, so lexicographic max = newest
-        latest = max(candidates, key=lambda p: os.path.basename(p))
-        return latest
+    if latest:
+        return os.path.join(LOG_DIR, latest)
 
     # Fallback to old single-file logging, if it exists
     if os.path.exists(FALLBACK_LOG_FILE):
@@ -52,46 +122,120 @@ def find_latest_log_file() -> str:
     raise FileNotFoundError("No ETL log file found in 'logs/' directory.")
 
 
-def analyze_logs() -> None:
-    log_file = find_latest_log_file()
-    print(f"Analyzing log file: {log_file}\n")
+def _load_state(log_file: str) -> Tuple[int, List[str], Counter, Counter]:
+    """
+    Return (offset, errors, api_status_counts, no_metrics_counts) from a
+    previous scan of log_file, or an empty state if there is none, it was
+    for another file, or the file has been truncated/replaced since.
+    """
+    empty = (0, [], Counter(), Counter())
+    try:
+        with open(STATE_FILE, "r", encoding="utf-8") as f:
+            state: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError):
+        return empty
+
+    offset = state.get("offset", 0)
+    if state.get("path") != log_file or offset > os.path.getsize(log_file):
+        return empty
+
+    return (
+        offset,
+        list(state.get("errors", [])),
+        Counter(state.get("api_status_counts", {})),
+        Counter(state.get("no_metrics_counts", {})),
+    )
+
+
+def _save_state(
+    log_file: str,
+    offset: int,
+    errors: List[str],
+    api_status_counts: Counter,
+    no_metrics_counts: Counter,
+) -> None:
+    """Persist the scan position and results; failures are not fatal."""
+    state = {
+        "path": log_file,
+        "offset": offset,
+        "errors": errors,
+        "api_status_counts": dict(api_status_counts),
+        "no_metrics_counts": dict(no_metrics_counts),
+    }
+    try:
+        with open(STATE_FILE, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+    except OSError as exc:
+        print(f"(could not write scan state {STATE_FILE}: {exc})")
 
-    errors = []
-    api_status_counts = Counter()
-    no_metrics_counts = Counter()
 
-    with open(log_file, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.rstrip("\n")
+def analyze_logs(incremental: bool = True) -> None:
+    """
+    Print the error summary of the latest log file.
+    With incremental=True (default) only the part appended since the last
+    run is scanned and merged with the remembered results.
+    """
+    log_file = find_latest_log_file()
+    print(f"Analyzing log file: {log_file}\n")
 
-            # 1) Collect ERROR lines + extract HTTP codes
-            if "ERROR" in line:
-                errors.append(line)
+    if incremental:
+        offset, errors, api_status_counts, no_metrics_counts = _load_state(log_file)
+    else:
+        offset, errors, api_status_counts, no_metrics_counts = 0, [], Counter(), Counter()
 
-                status_code = None
+    # Raw (bytes) hits are collected in plain lists during the scan and
+    # counted in one go afterwards; Counter.update over an iterable runs
+    # its counting loop in C.
+    status_hits = []
+    symbol_hits = []
+    # Result sizes before an unterminated last line: that line is reported,
+    # but it is scanned again (complete) next time, so it is not saved
+    saved_marks = None
 
-                m1 = API_STATUS_RE.search(line)
-                if m1:
-                    status_code = m1.group(1)
+    with open(log_file, "rb") as f:
+        f.seek(offset)
+        for block, consumed in _iter_line_chunks(f):
+            if not consumed:
+                saved_marks = (len(errors), len(status_hits), len(symbol_hits))
+            offset += consumed
+            # Skip whole 64 KiB blocks without anything of interest
+            if ERROR_MARKER not in block and NO_METRICS_MARKER not in block:
+                continue
 
-                m2 = HTTPERROR_RE.search(line)
-                if m2:
-                    status_code = m2.group(1)
+            for line in block.split(b"\n"):
+                is_error = ERROR_MARKER in line
+                if is_error:
+                    errors.append(_decode(line))
+                elif NO_METRICS_MARKER not in line:
+                    continue
 
-                if status_code:
-                    api_status_counts[status_code] += 1
+                # 1) HTTP codes + problematic API URLs (ERROR lines only)
+                if is_error:
+                    # HTTPError code takes precedence over our own status message
+                    m = HTTPERROR_RE.search(line) or API_STATUS_RE.search(line)
+                    if m:
+                        status_hits.append(m.group(1))
+                    m = SYMBOL_IN_URL_RE.search(line)
+                    if m:
+                        symbol_hits.append(m.group(1))
 
-                # Extract symbol from problematic API URL
-                m3 = SYMBOL_IN_URL_RE.search(line)
-                if m3:
-                    symbol = m3.group(1)
-                    no_metrics_counts[symbol] += 1
+                # 2) Collect symbols where metrics are missing
+                m = NO_METRICS_RE.search(line)
+                if m:
+                    symbol_hits.append(m.group(1))
 
-            # 2) Collect symbols where metrics are missing
-            m4 = NO_METRICS_RE.search(line)
-            if m4:
-                symbol = m4.group(1)
-                no_metrics_counts[symbol] += 1
+    if saved_marks is None:
+        saved_marks = (len(errors), len(status_hits), len(symbol_hits))
+    n_errors, n_status, n_symbols = saved_marks
+    _save_state(
+        log_file,
+        offset,
+        errors[:n_errors],
+        api_status_counts + _count_decoded(status_hits[:n_status]),
+        no_metrics_counts + _count_decoded(symbol_hits[:n_symbols]),
+    )
+    api_status_counts.update(_count_decoded(status_hits))
+    no_metrics_counts.update(_count_decoded(symbol_hits))
 
     # OUTPUT
     print("ERROR SUMMARY")
@@ -117,4 +261,11 @@ def analyze_logs() -> None:
 
 
 if __name__ == "__main__":
-    analyze_logs()
+    parser = argparse.ArgumentParser(description="Summarize the latest ETL log file.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"ignore {STATE_FILE} and rescan the whole file",
+    )
+    args = parser.parse_args()
+    analyze_logs(incremental=not args.full)
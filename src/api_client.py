@@ -5,13 +5,42 @@ Responsibilities:
 - Provide convenience methods for all required endpoints
 - Centralize error handling and simple retry logic
 """
+import hashlib
+import json
+import math
 import os
 import time
+import random
 import logging
-from typing import Any, Dict, Optional, Set
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+
+def _json_loads(content: bytes) -> Any:
+    """
+    Parse a JSON response body with orjson (Rust/SIMD, no intermediate str).
+    orjson rejects the non-standard NaN / Infinity tokens that the stdlib
+    parser (and so response.json()) accepts; such payloads fall back to json.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(content)
+
+
+try:
+    # Persistent HTTP cache for rarely changing endpoints (optional)
+    import requests_cache
+except ImportError:  # pragma: no cover - depends on the environment
+    requests_cache = None
+
 logger = logging.getLogger(__name__)
 load_dotenv()
 
@@ -40,12 +69,37 @@ HEADERS = {
 # How many times to retry for retry-able HTTP status codes
 MAX_RETRIES_DEFAULT = int(os.getenv("FIINDO_MAX_RETRIES", "3"))
 
-# How long to wait (in seconds) between retries
+# Base wait (in seconds) between retries. The actual delay grows
+# exponentially per attempt (base * 2**(attempt-1)) with full jitter.
 BACKOFF_SECONDS_DEFAULT = float(os.getenv("FIINDO_RETRY_BACKOFF", "30"))
 
+# Upper bound for a single retry delay (also caps server Retry-After hints)
+MAX_BACKOFF_SECONDS_DEFAULT = float(os.getenv("FIINDO_RETRY_MAX_BACKOFF", "120"))
+
 # Per-request timeout in seconds
 API_TIMEOUT_DEFAULT = float(os.getenv("FIINDO_API_TIMEOUT", "90"))
 
+# Size of the keep-alive connection pool per host. requests defaults to 10,
+# which is smaller than the number of concurrent calls made by the ETL
+# workers and causes connections to be discarded and re-opened (new TLS
+# handshake) under load.
+HTTP_POOL_SIZE_DEFAULT = int(os.getenv("FIINDO_HTTP_POOL_SIZE", "32"))
+
+# Transport-level retries for failed connection attempts (connection
+# refused / reset before the request was sent), handled by urllib3 inside
+# the pooled adapter. HTTP status retries stay in FiindoAPI._get.
+CONNECT_RETRIES_DEFAULT = int(os.getenv("FIINDO_CONNECT_RETRIES", "3"))
+
+# Persistent on-disk HTTP cache (requests-cache, SQLite backend) for the
+# rarely changing /symbols and /general endpoints, so repeated ETL runs
+# skip most of the /general traffic. Expired entries are revalidated
+# with ETag / Last-Modified when the server provides them.
+# Financials and EOD prices are never cached on disk. Opt-in: a cached
+# /symbols list can be up to FIINDO_HTTP_CACHE_TTL seconds old.
+HTTP_CACHE_ENABLED = os.getenv("FIINDO_HTTP_CACHE", "false").lower() in {"1", "true", "yes"}
+HTTP_CACHE_FILE = os.getenv("FIINDO_HTTP_CACHE_FILE", ".fiindo_http_cache")
+HTTP_CACHE_TTL_SECONDS = int(os.getenv("FIINDO_HTTP_CACHE_TTL", "86400"))
+
 # Comma-separated list of HTTP status codes that should be retried
 _retry_codes_raw = os.getenv("FIINDO_RETRY_STATUS_CODES", "429,500")
 RETRY_STATUS_CODES_DEFAULT: Set[int] = {
@@ -70,6 +124,28 @@ FIINDO_ENABLE_SPEEDBOOST = os.getenv("FIINDO_ENABLE_SPEEDBOOST", "false").lower(
 # with a final fallback to the official Fiindo speedboost endpoint.
 FIINDO_SPEEDBOOST_URL = os.getenv("FIINDO_SPEEDBOOST_URL", "").strip()
 
+DEFAULT_SPEEDBOOST_URL = "https://api.test.fiindo.com/api/v1/speedboost"
+
+
+def _resolve_speedboost_url() -> Tuple[str, str]:
+    """
+    Resolve the speedboost URL once at import time.
+    Returns (url, source) where source is "env", "auto-generated" or "default".
+    1) If FIINDO_SPEEDBOOST_URL is set → use that.
+    2) Else auto-build: BASE_URL + '/speedboost'
+    3) If that yields nothing → fallback to DEFAULT_SPEEDBOOST_URL
+    """
+    if FIINDO_SPEEDBOOST_URL:
+        return FIINDO_SPEEDBOOST_URL, "env"
+    base = BASE_URL.rstrip("/")
+    if base:
+        return base + "/speedboost", "auto-generated"
+    return DEFAULT_SPEEDBOOST_URL, "default"
+
+
+SPEEDBOOST_URL, SPEEDBOOST_URL_SOURCE = _resolve_speedboost_url()
+SPEEDBOOST_PAYLOAD = {"first_name": FIRST_NAME, "last_name": LAST_NAME}
+
 class FiindoAPI:
     """Small helper client wrapping requests.Session for the Fiindo API."""
 
@@ -78,20 +154,128 @@ class FiindoAPI:
         base_url: str = BASE_URL,
         max_retries: int = MAX_RETRIES_DEFAULT,
         backoff_seconds: float = BACKOFF_SECONDS_DEFAULT,
+        max_backoff_seconds: float = MAX_BACKOFF_SECONDS_DEFAULT,
         timeout_seconds: float = API_TIMEOUT_DEFAULT,
         retry_status_codes: Optional[Set[int]] = None,
+        pool_size: int = HTTP_POOL_SIZE_DEFAULT,
     ):
         self.base_url = base_url.rstrip("/")
         self.max_retries = max_retries
         self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
         self.timeout_seconds = timeout_seconds
         self.retry_status_codes = (
             retry_status_codes if retry_status_codes is not None else RETRY_STATUS_CODES_DEFAULT
         )
 
-        self.session = requests.Session()
+        self.session = self._create_session()
         self.session.headers.update(HEADERS)
 
+        # Larger keep-alive pool so concurrent workers reuse TCP/TLS connections
+        self.pool_size = 0
+        self.set_pool_size(pool_size)
+
+    def _create_session(self) -> requests.Session:
+        """
+        Plain requests.Session, or a requests-cache CachedSession that only
+        stores /symbols and /general responses (see HTTP_CACHE_*).
+        """
+        if not HTTP_CACHE_ENABLED or requests_cache is None:
+            return requests.Session()
+
+        # requests-cache strips the Authorization header before matching,
+        # so keep one cache file per credential instead (hashed, the
+        # token itself never ends up in a file name)
+        credential = hashlib.sha256(HEADERS[AUTH_HEADER_NAME].encode()).hexdigest()[:12]
+        return requests_cache.CachedSession(
+            cache_name=f"{HTTP_CACHE_FILE}_{credential}",
+            backend="sqlite",
+            # Everything not listed below bypasses the cache
+            expire_after=requests_cache.DO_NOT_CACHE,
+            urls_expire_after={
+                f"{self.base_url}/symbols": HTTP_CACHE_TTL_SECONDS,
+                f"{self.base_url}/general/*": HTTP_CACHE_TTL_SECONDS,
+            },
+            allowable_codes=(200,),
+        )
+
+    def set_pool_size(self, pool_size: int) -> None:
+        """(Re-)mount the HTTP adapter with a keep-alive pool of pool_size connections."""
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            # Only connection attempts (incl. connect timeouts) are retried
+            # here. read=False / status=0 leave read timeouts and retry-able
+            # status codes to the loop in _get() (read=False re-raises the
+            # original error, so requests still raises ReadTimeout).
+            max_retries=Retry(
+                total=None,
+                connect=CONNECT_RETRIES_DEFAULT,
+                read=False,
+                status=0,
+                backoff_factor=0.3,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.pool_size = pool_size
+
+    # Retry delay helpers
+    @staticmethod
+    def _server_retry_hint(response: requests.Response) -> Optional[float]:
+        """
+        Seconds to wait as requested by the server, if any:
+        - Retry-After: delta-seconds or HTTP date
+        - X-RateLimit-Reset (429 only): epoch timestamp or delta-seconds
+        """
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                value = float(retry_after)
+            except ValueError:
+                value = None
+            if value is None:
+                try:
+                    when = parsedate_to_datetime(retry_after)
+                    if when.tzinfo is None:
+                        when = when.replace(tzinfo=timezone.utc)
+                    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+                except (TypeError, ValueError):
+                    pass
+            # "nan" / "inf" parse as floats but are no usable delay
+            elif math.isfinite(value):
+                return max(0.0, value)
+
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset and response.status_code == 429:
+            try:
+                value = float(reset)
+            except ValueError:
+                return None
+            if not math.isfinite(value):
+                return None
+            # Large values are absolute epoch timestamps, small ones are deltas
+            if value > 1e9:
+                value -= time.time()
+            return max(0.0, value)
+
+        return None
+
+    def _retry_delay(
+        self, attempts: int, response: Optional[requests.Response] = None
+    ) -> float:
+        """
+        Delay before the next attempt: the server hint if present, otherwise
+        exponential backoff with full jitter. Always capped at max_backoff_seconds.
+        """
+        if response is not None:
+            hint = self._server_retry_hint(response)
+            if hint is not None:
+                return min(self.max_backoff_seconds, hint)
+
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        return random.uniform(0, delay)
+
     # Low-level GET helper
     def _get(
         self,
@@ -104,6 +288,7 @@ class FiindoAPI:
         or None for 404 / certain recoverable errors.
         Raises an exception for unexpected failures.
         """
+
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         attempts = 0
 
@@ -117,6 +302,10 @@ class FiindoAPI:
                     params=params,
                     timeout=self.timeout_seconds,
                 )
+            except requests.ConnectTimeout:
+                # Already retried CONNECT_RETRIES_DEFAULT times by the adapter
+                logger.error("Connect timeout for %s – giving up.", url)
+                return None
             except requests.Timeout:
                 logger.warning(
                     "Timeout after %.1fs for %s (attempt %s/%s)",
@@ -128,7 +317,7 @@ class FiindoAPI:
                 if attempts > self.max_retries:
                     logger.error("Giving up on %s after repeated timeouts.", url)
                     return None
-                time.sleep(self.backoff_seconds)
+                time.sleep(self._retry_delay(attempts))
                 continue
 
             logger.debug("Response %s for %s", response.status_code, url)
@@ -136,10 +325,11 @@ class FiindoAPI:
             # Success path
             if response.status_code == 200:
                 try:
-                    return response.json()
+                    data = _json_loads(response.content)
                 except Exception as exc:
                     logger.error("Failed to decode JSON from %s: %s", url, exc)
                     raise
+                return data
 
             # Retry-able conditions
             if response.status_code in self.retry_status_codes:
@@ -151,15 +341,16 @@ class FiindoAPI:
                     )
                     return None
 
+                delay = self._retry_delay(attempts, response)
                 logger.warning(
                     "%s error for %s – retrying in %.1fs (attempt %s/%s)",
                     response.status_code,
                     url,
-                    self.backoff_seconds,
+                    delay,
                     attempts,
                     self.max_retries,
                 )
-                time.sleep(self.backoff_seconds)
+                time.sleep(delay)
                 continue
 
             # Non-retry conditions
@@ -183,9 +374,15 @@ class FiindoAPI:
             response.raise_for_status()
 
     # High-level endpoint helpers
-    def get_symbols(self) -> list[str]:
-        """Return the list of all available symbols from /symbols."""
-        data = self._get("symbols")
+    def get_symbols(self, industries: Optional[Iterable[str]] = None) -> list[str]:
+        """
+        Return the list of all available symbols from /symbols.
+        industries: optional industry filter, forwarded as a comma-separated
+        `industry` query parameter. The filter is not part of the documented
+        API, so a server may ignore it and return the full universe.
+        """
+        params = {"industry": ",".join(sorted(industries))} if industries else None
+        data = self._get("symbols", params=params)
         return data.get("symbols", []) if data else []
 
     def get_general(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -211,49 +408,54 @@ class FiindoAPI:
         return self._get(f"debug/{symbol}")
 
 
-def enable_speedboost() -> None:
+# Process-wide client shared by the fetcher, calculator and helper scripts
+_shared_api: Optional[FiindoAPI] = None
+_shared_api_lock = threading.Lock()
+
+
+def get_shared_api(min_pool_size: int = 0) -> FiindoAPI:
+    """
+    Return the process-wide FiindoAPI instance, creating it on first use.
+    requests.Session is safe to share between threads for GET requests,
+    so all callers reuse one connection pool.
+    min_pool_size grows the keep-alive pool if a caller needs more
+    concurrent connections than currently configured.
+    """
+    global _shared_api
+    with _shared_api_lock:
+        if _shared_api is None:
+            _shared_api = FiindoAPI(pool_size=max(HTTP_POOL_SIZE_DEFAULT, min_pool_size))
+        elif min_pool_size > _shared_api.pool_size:
+            _shared_api.set_pool_size(min_pool_size)
+        return _shared_api
+
+
+def enable_speedboost(api: Optional[FiindoAPI] = None) -> None:
     """
     Enables Fiindo's 'speed boost' mode.
-    Resolution logic for the speedboost URL:
-    1) If FIINDO_SPEEDBOOST_URL is set → use that.
-    2) Else auto-build: BASE_URL + '/speedboost'
-    3) If auto-building fails → fallback to:
-         https://api.test.fiindo.com/api/v1/speedboost
+    The URL is resolved once at import time (see _resolve_speedboost_url).
+    The request goes through the given api client (default: the shared
+    client), so it reuses an already pooled connection and warms it up
+    for the ETL.
     This function NEVER stops the ETL. All errors are logged only.
     """
     if not FIINDO_ENABLE_SPEEDBOOST:
         logger.info("Speed boost disabled (FIINDO_ENABLE_SPEEDBOOST is not true).")
         return
 
-    # 1) ENV override?
-    url = None
-    if FIINDO_SPEEDBOOST_URL:
-        url = FIINDO_SPEEDBOOST_URL
-        logger.info("Speedboost URL (from env): %s", url)
+    url = SPEEDBOOST_URL
+    if SPEEDBOOST_URL_SOURCE == "default":
+        logger.warning("Falling back to default Speedboost URL: %s", url)
     else:
-        # 2) Attempt auto-generation from BASE_URL
-        try:
-            auto_url = BASE_URL.rstrip("/") + "/speedboost"
-            url = auto_url
-            logger.info("Speedboost URL (auto-generated): %s", url)
-        except Exception:
-            url = None
-
-    # 3) Final fallback
-    if not url:
-        url = "https://api.test.fiindo.com/api/v1/speedboost"
-        logger.warning(
-            "Falling back to default Speedboost URL: %s",
-            url,
-        )
+        logger.info("Speedboost URL (%s): %s", SPEEDBOOST_URL_SOURCE, url)
 
-    payload = {"first_name": FIRST_NAME, "last_name": LAST_NAME}
+    session = (api if api is not None else get_shared_api()).session
     try:
         logger.warning("Requesting Fiindo speed boost for this account…")
-        resp = requests.post(
+        # Auth headers are already set on the session
+        resp = session.post(
             url,
-            json=payload,
-            headers=HEADERS,
+            json=SPEEDBOOST_PAYLOAD,
             timeout=API_TIMEOUT_DEFAULT,
         )
 
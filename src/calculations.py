@@ -7,16 +7,61 @@ Metrics:
 - DebtRatio: totalDebt / totalEquity from last full year
 """
 import logging
-from typing import Optional, Dict, Any, List
-from src.api_client import FiindoAPI
+import math
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Optional, Dict, Any, List, Tuple
+from src.api_client import get_shared_api
 
 logger = logging.getLogger(__name__)
 
+# One worker per endpoint needed for a single symbol
+# (income_statement, balance_sheet_statement, eod)
+REQUESTS_PER_SYMBOL = 3
+
+def _to_float(value: Any) -> float:
+    """float(value), or NaN if the value is missing or not numeric."""
+    if value is None:
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _ratio(numerator: float, denominator: float) -> float:
+    """numerator / denominator, NaN for a zero (or NaN) denominator."""
+    return numerator / denominator if denominator != 0 else math.nan
+
+def _none_if_nan(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
 class Calculator:
     """Fetches raw financials for a symbol and derives all required KPIs."""
 
-    def __init__(self) -> None:
-        self.api = FiindoAPI()
+    def __init__(self, max_workers: int = REQUESTS_PER_SYMBOL) -> None:
+        # Shared client; keep at least one pooled connection per in-flight
+        # request so concurrent calls never fall back to new connections.
+        self.api = get_shared_api(min_pool_size=max_workers)
+        # Executor used to dispatch the per-symbol API calls concurrently.
+        # A single Calculator may be shared between threads; size the pool
+        # accordingly (REQUESTS_PER_SYMBOL * number of calling threads).
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self) -> None:
+        """Shut down the internal executor."""
+        self.executor.shutdown(wait=True)
+
+    def _fetch_raw(
+        self, symbol: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Fetch income statement, balance sheet and EOD data for one symbol
+        concurrently (one round-trip of latency instead of three).
+        """
+        f_income = self.executor.submit(self.api.get_financials, symbol, "income_statement")
+        f_balance = self.executor.submit(self.api.get_financials, symbol, "balance_sheet_statement")
+        f_eod = self.executor.submit(self.api.get_eod, symbol)
+        wait([f_income, f_balance, f_eod])
+        return f_income.result(), f_balance.result(), f_eod.result()
 
     def calculate_all(self, symbol: str) -> Optional[Dict[str, float]]:
         """
@@ -30,9 +75,9 @@ class Calculator:
         or None if calculation is not possible.
         """
         logger.info("Starting calculations for %s", symbol)
+        income, balance, eod = self._fetch_raw(symbol)
 
         # Income Statement (quarters) 
-        income = self.api.get_financials(symbol, "income_statement")
         if not income:
             logger.warning("No income_statement data for %s", symbol)
             return None
@@ -52,25 +97,24 @@ class Calculator:
             return None
         Q1, Q2, Q3, Q4 = quarters[:4]
 
+        # Extract all quarterly inputs once; missing / invalid values become
+        # NaN and simply propagate through the arithmetic below.
+        rev1 = _to_float(Q1.get("revenue"))
+        rev2 = _to_float(Q2.get("revenue"))
+        net_incomes = [_to_float(q.get("netIncome")) for q in (Q1, Q2, Q3, Q4)]
+        eps = _to_float(Q1.get("eps"))
+
         # Revenue Growth (QoQ)
-        revenue_growth = None
-        try:
-            rev1 = float(Q1["revenue"])
-            rev2 = float(Q2["revenue"])
-            if rev2 != 0:
-                revenue_growth = (rev1 - rev2) / rev2
-        except Exception as exc:
-            logger.warning("Failed to compute revenue growth for %s: %s", symbol, exc)
+        if math.isnan(rev1) or math.isnan(rev2):
+            logger.warning("Failed to compute revenue growth for %s: missing revenue", symbol)
+        revenue_growth = _ratio(rev1 - rev2, rev2)
 
         # Net Income TTM
-        net_income_ttm = None
-        try:
-            net_income_ttm = float(Q1["netIncome"]) + float(Q2["netIncome"]) + float(Q3["netIncome"]) + float(Q4["netIncome"])
-        except Exception as exc:
-            logger.warning("Failed to compute net_income_ttm for %s: %s", symbol, exc)
+        net_income_ttm = sum(net_incomes)
+        if math.isnan(net_income_ttm):
+            logger.warning("Failed to compute net_income_ttm for %s: missing netIncome", symbol)
 
         # Balance Sheet (full years) 
-        balance = self.api.get_financials(symbol, "balance_sheet_statement")
         if not balance:
             logger.warning("No balance_sheet_statement data for %s", symbol)
             return None
@@ -90,17 +134,13 @@ class Calculator:
         FY = years[0]
 
         # Debt Ratio
-        debt_ratio = None
-        try:
-            total_debt = float(FY["totalDebt"])
-            total_equity = float(FY["totalEquity"])
-            if total_equity != 0:
-                debt_ratio = total_debt / total_equity
-        except Exception as exc:
-            logger.warning("Failed to compute debt_ratio for %s: %s", symbol, exc)
+        total_debt = _to_float(FY.get("totalDebt"))
+        total_equity = _to_float(FY.get("totalEquity"))
+        if math.isnan(total_debt) or math.isnan(total_equity):
+            logger.warning("Failed to compute debt_ratio for %s: missing totalDebt/totalEquity", symbol)
+        debt_ratio = _ratio(total_debt, total_equity)
 
         # EOD price 
-        eod = self.api.get_eod(symbol)
         if not eod or "stockprice" not in eod:
             logger.warning("No EOD data for %s", symbol)
             return None
@@ -112,20 +152,16 @@ class Calculator:
             return None
 
         # PE Ratio 
-        pe_ratio = None
-        try:
-            eps = float(Q1["eps"])
-            if eps != 0:
-                pe_ratio = latest_price / eps
-        except Exception as exc:
-            logger.warning("Failed to compute PE ratio for %s: %s", symbol, exc)
+        if math.isnan(eps):
+            logger.warning("Failed to compute PE ratio for %s: missing eps", symbol)
+        pe_ratio = _ratio(latest_price, eps)
 
         result = {
-            "pe_ratio": pe_ratio,
-            "revenue_growth": revenue_growth,
-            "net_income_ttm": net_income_ttm,
-            "debt_ratio": debt_ratio,
-            "latest_revenue": float(Q1["revenue"]) if Q1.get("revenue") is not None else None,
+            "pe_ratio": _none_if_nan(pe_ratio),
+            "revenue_growth": _none_if_nan(revenue_growth),
+            "net_income_ttm": _none_if_nan(net_income_ttm),
+            "debt_ratio": _none_if_nan(debt_ratio),
+            "latest_revenue": _none_if_nan(rev1),
         }
 
         logger.info("Finished calculations for %s", symbol)
@@ -7,6 +7,7 @@ It prints:
 - Basic sanity checks (duplicates, missing industries)
 """
 from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from src.models import (
     SessionLocal,
     Ticker,
@@ -16,30 +17,29 @@ from src.models import (
     IndustryStatsHistory,
 )
 
-def query_table(session, model):
-    return session.query(model).all()
+def count_table(session, model) -> int:
+    # COUNT(*) in SQL instead of materializing every row
+    return session.query(model).count()
 
-def preview_table(session, model, limit: int = 5):
-    return session.query(model).limit(limit).all()
+def preview_table(session, model, limit: int = 5, options=()):
+    return session.query(model).options(*options).limit(limit).all()
 
 def run_checks() -> None:
     session = SessionLocal()
     # 1) Ticker master data
     print("STARTING DB CHECK\n")
     print("Ticker table (master data)")
-    tickers = query_table(session, Ticker)
-    print(f"Number of tickers: {len(tickers)}")
+    print(f"Number of tickers: {count_table(session, Ticker)}")
     for t in preview_table(session, Ticker):
         print(f"- {t.symbol} | {t.company} | {t.industry} | {t.exchange}")
     print()
 
     # 2) TickerStats (current snapshot)
     print("TickerStats (current metrics)")
-    stats = query_table(session, TickerStats)
-    print(f"Number of TickerStats rows: {len(stats)}")
-    for s in preview_table(session, TickerStats):
-        # use Session.get() instead of Query.get() to avoid legacy warning
-        ticker = session.get(Ticker, s.ticker_id)
+    print(f"Number of TickerStats rows: {count_table(session, TickerStats)}")
+    # Load the ticker in the same query (JOIN) instead of one lookup per row
+    for s in preview_table(session, TickerStats, options=(joinedload(TickerStats.ticker),)):
+        ticker = s.ticker
         sym = ticker.symbol if ticker else f"id={s.ticker_id}"
         print(
             f"- {sym} | PE={s.pe_ratio} | RevGrowth={s.revenue_growth} "
@@ -49,8 +49,7 @@ def run_checks() -> None:
 
     # 3) IndustryStats (current snapshot)
     print("IndustryStats (industry aggregates)")
-    ind = query_table(session, IndustryStats)
-    print(f"Number of industries (IndustryStats): {len(ind)}")
+    print(f"Number of industries (IndustryStats): {count_table(session, IndustryStats)}")
     for i in preview_table(session, IndustryStats):
         print(
             f"- {i.industry} | AvgPE={i.avg_pe_ratio} | "
@@ -60,8 +59,8 @@ def run_checks() -> None:
 
     # 4) History tables
     print("History tables")
-    print(f"TickerStatsHistory: {session.query(TickerStatsHistory).count()} rows")
-    print(f"IndustryStatsHistory: {session.query(IndustryStatsHistory).count()} rows")
+    print(f"TickerStatsHistory: {count_table(session, TickerStatsHistory)} rows")
+    print(f"IndustryStatsHistory: {count_table(session, IndustryStatsHistory)} rows")
     print()
 
     # 5) Extra sanity checks
@@ -86,7 +85,7 @@ def run_checks() -> None:
         "Consumer Electronics",
     }
 
-    found_industries = {i.industry for i in ind}
+    found_industries = {industry for (industry,) in session.query(IndustryStats.industry)}
     missing = EXPECTED_INDUSTRIES - found_industries
     if missing:
         print("Industries missing in IndustryStats:", missing)
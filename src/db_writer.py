@@ -7,9 +7,10 @@ Responsibilities:
 - Aggregate per industry and write IndustryStats / IndustryStatsHistory
 """
 import logging
+import os
 from datetime import datetime
-from typing import Dict
-from sqlalchemy import delete
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import DateTime, Index, delete, func, insert, inspect, literal, select
 from src.models import (
     SessionLocal,
     Ticker,
@@ -21,6 +22,11 @@ from src.models import (
 
 logger = logging.getLogger(__name__)
 
+# Drop the TickerStats indexes after clearing the snapshot and re-create
+# them once all ticker rows are in (one index build instead of per-row
+# B-tree updates during the bulk inserts).
+DEFER_INDEXES = os.getenv("FIINDO_DEFER_INDEXES", "false").lower() in {"1", "true", "yes"}
+
 class DBWriter:
     """
     Handles all "Load" logic of the ETL pipeline.
@@ -32,6 +38,33 @@ class DBWriter:
 
     def __init__(self) -> None:
         self.db = SessionLocal()
+        # symbol -> ticker_id, loaded lazily on first use (the fetcher
+        # usually inserts tickers after the writer has been created)
+        self._ticker_ids: Optional[Dict[str, int]] = None
+        # TickerStats indexes dropped by clear_current_tables() (FIINDO_DEFER_INDEXES)
+        self._dropped_indexes: List[Index] = []
+
+    # Ticker id cache
+
+    def _resolve_ticker_ids(self, symbols: Iterable[str]) -> Dict[str, int]:
+        """
+        Return the cached symbol -> ticker_id map.
+        Loaded with one query on first use; symbols not yet cached
+        (tickers added later in the run) are looked up once more.
+        """
+        # Core SELECTs: plain (symbol, id) tuples, no ORM query machinery
+        lookup = select(Ticker.__table__.c.symbol, Ticker.__table__.c.id)
+        if self._ticker_ids is None:
+            self._ticker_ids = dict(self.db.execute(lookup).tuples().all())
+
+        missing = [s for s in symbols if s not in self._ticker_ids]
+        if missing:
+            self._ticker_ids.update(
+                self.db.execute(
+                    lookup.where(Ticker.__table__.c.symbol.in_(missing))
+                ).tuples().all()
+            )
+        return self._ticker_ids
 
     # Clear current tables
 
@@ -43,11 +76,55 @@ class DBWriter:
         History tables are never touched.
         """
         logger.info("Clearing current snapshot tables (TickerStats & IndustryStats)...")
+        # An unqualified DELETE (no WHERE, no triggers) hits SQLite's
+        # truncate optimization: pages are released without per-row work.
         self.db.execute(delete(TickerStats))
         self.db.execute(delete(IndustryStats))
+        if DEFER_INDEXES:
+            self._drop_ticker_stats_indexes()
         self.db.commit()
         logger.info("Successfully cleared TickerStats & IndustryStats.")
 
+    # Deferred indexes
+
+    def _drop_ticker_stats_indexes(self) -> None:
+        """
+        Drop the secondary indexes of the (now empty) TickerStats table.
+        Only indexes that exist in the database are dropped and remembered,
+        so restore_indexes() never creates one the schema did not have.
+        """
+        connection = self.db.connection()
+        existing = {
+            index["name"]
+            for index in inspect(connection).get_indexes(TickerStats.__tablename__)
+        }
+        for index in TickerStats.__table__.indexes:
+            if index.name in existing:
+                index.drop(bind=connection)
+                self._dropped_indexes.append(index)
+        logger.info(
+            "Dropped %d TickerStats index(es) until the bulk insert is done.",
+            len(self._dropped_indexes),
+        )
+
+    def restore_indexes(self, commit: bool = True) -> None:
+        """
+        Re-create the TickerStats indexes dropped by clear_current_tables()
+        (FIINDO_DEFER_INDEXES); no-op if nothing was deferred.
+        Called by aggregate_industries() (which needs them for the join) and
+        by run_etl() in a finally block.
+        """
+        if not self._dropped_indexes:
+            return
+        connection = self.db.connection()
+        for index in self._dropped_indexes:
+            index.create(bind=connection)
+        restored = len(self._dropped_indexes)
+        self._dropped_indexes = []
+        if commit:
+            self.db.commit()
+        logger.info("Re-created %d TickerStats index(es).", restored)
+
     # Ticker metrics
     def save_ticker_stats(self, symbol: str, stats: Dict) -> None:
         """
@@ -55,42 +132,57 @@ class DBWriter:
         - Insert into TickerStats (current snapshot)
         - Insert into TickerStatsHistory (append-only)
         """
-        ticker = (
-            self.db.query(Ticker)
-            .filter(Ticker.symbol == symbol)
-            .one_or_none()
-        )
+        self.save_ticker_stats_bulk([(symbol, stats)])
 
-        if not ticker:
-            logger.warning("Ticker %s not found in DB (did the fetcher run?)", symbol)
-            return
+    def save_ticker_stats_bulk(
+        self, results: List[Tuple[str, Dict]], commit: bool = True
+    ) -> int:
+        """
+        Persist calculated metrics for many tickers in one transaction.
+        - symbol -> ticker_id resolved from the per-run cache
+        - One Core multi-row INSERT into TickerStats and TickerStatsHistory
+          (plain dict rows, no ORM objects / unit-of-work bookkeeping)
+        - One commit (pass commit=False to keep the transaction open,
+          e.g. to write several batches + aggregates with a single commit)
+        Returns the number of tickers saved.
+        """
+        if not results:
+            return 0
+
+        ticker_ids = self._resolve_ticker_ids(symbol for symbol, _ in results)
+        # One explicit timestamp for the whole batch: the column defaults
+        # are never evaluated per row, and snapshot and history rows of a
+        # run carry the exact same value.
         now = datetime.utcnow()
 
-        # Current snapshot
-        current = TickerStats(
-            ticker_id=ticker.id,
-            pe_ratio=stats.get("pe_ratio"),
-            revenue_growth=stats.get("revenue_growth"),
-            net_income_ttm=stats.get("net_income_ttm"),
-            debt_ratio=stats.get("debt_ratio"),
-            latest_revenue=stats.get("latest_revenue"),
-            calculated_at=now,
-        )
-        self.db.add(current)
-
-        # History row
-        history = TickerStatsHistory(
-            ticker_id=ticker.id,
-            pe_ratio=stats.get("pe_ratio"),
-            revenue_growth=stats.get("revenue_growth"),
-            net_income_ttm=stats.get("net_income_ttm"),
-            debt_ratio=stats.get("debt_ratio"),
-            latest_revenue=stats.get("latest_revenue"),
-            created_at=now,
-        )
-        self.db.add(history)
-        self.db.commit()
-        logger.info("Saved stats for %s (ticker_id=%s)", symbol, ticker.id)
+        current_rows: List[Dict] = []
+        history_rows: List[Dict] = []
+        for symbol, stats in results:
+            ticker_id = ticker_ids.get(symbol)
+            if ticker_id is None:
+                logger.warning("Ticker %s not found in DB (did the fetcher run?)", symbol)
+                continue
+
+            values = {
+                "ticker_id": ticker_id,
+                "pe_ratio": stats.get("pe_ratio"),
+                "revenue_growth": stats.get("revenue_growth"),
+                "net_income_ttm": stats.get("net_income_ttm"),
+                "debt_ratio": stats.get("debt_ratio"),
+                "latest_revenue": stats.get("latest_revenue"),
+            }
+            # Current snapshot
+            current_rows.append({**values, "calculated_at": now})
+            # History row
+            history_rows.append({**values, "created_at": now})
+
+        if current_rows:
+            self.db.execute(TickerStats.__table__.insert(), current_rows)
+            self.db.execute(TickerStatsHistory.__table__.insert(), history_rows)
+        if commit:
+            self.db.commit()
+        logger.info("Saved stats for %d ticker(s)", len(current_rows))
+        return len(current_rows)
 
     # Industry aggregates
     def aggregate_industries(self) -> None:
@@ -99,59 +191,45 @@ class DBWriter:
         - Average P/E ratio across all tickers
         - Average revenue growth across all tickers
         - Sum of latest revenue
+        Everything runs inside the database: one INSERT ... SELECT with
+        GROUP BY fills IndustryStats, a second one copies the new snapshot
+        rows into IndustryStatsHistory. AVG/SUM ignore NULL metrics.
         """
+        # Build deferred indexes first: the aggregation joins on ticker_id
+        self.restore_indexes(commit=False)
         now = datetime.utcnow()
-        industries = [
-            row[0]
-            for row in self.db.query(Ticker.industry).distinct().all()
-            if row[0] is not None
-        ]
-        logger.info("Aggregating industry stats for %d industries", len(industries))
-        for industry in industries:
-            stats = (
-                self.db.query(TickerStats)
-                .join(Ticker, TickerStats.ticker_id == Ticker.id)
-                .filter(Ticker.industry == industry)
-                .all()
+        aggregates = (
+            select(
+                Ticker.industry,
+                func.avg(TickerStats.pe_ratio),
+                func.avg(TickerStats.revenue_growth),
+                func.sum(TickerStats.latest_revenue),
+                literal(now, DateTime),
             )
-            if not stats:
-                logger.info("No stats for industry %s – skipping", industry)
-                continue
-
-            valid_pe = [t.pe_ratio for t in stats if t.pe_ratio is not None]
-            valid_rg = [t.revenue_growth for t in stats if t.revenue_growth is not None]
-            valid_rev = [t.latest_revenue for t in stats if t.latest_revenue is not None]
-            avg_pe = sum(valid_pe) / len(valid_pe) if valid_pe else None
-            avg_rg = sum(valid_rg) / len(valid_rg) if valid_rg else None
-            sum_rev = sum(valid_rev) if valid_rev else None
-
-            # Current snapshot: always re-insert after clear_current_tables()
-            current = IndustryStats(
-                industry=industry,
-                avg_pe_ratio=avg_pe,
-                avg_revenue_growth=avg_rg,
-                sum_revenue=sum_rev,
-                calculated_at=now,
+            .join(TickerStats, TickerStats.ticker_id == Ticker.id)
+            .where(Ticker.industry.isnot(None))
+            .group_by(Ticker.industry)
+        )
+        # Current snapshot: always re-insert after clear_current_tables()
+        result = self.db.execute(
+            insert(IndustryStats).from_select(
+                ["industry", "avg_pe_ratio", "avg_revenue_growth", "sum_revenue", "calculated_at"],
+                aggregates,
             )
-            self.db.add(current)
+        )
 
-            # History row
-            history = IndustryStatsHistory(
-                industry=industry,
-                avg_pe_ratio=avg_pe,
-                avg_revenue_growth=avg_rg,
-                sum_revenue=sum_rev,
-                created_at=now,
-            )
-            self.db.add(history)
-
-            logger.info(
-                "Aggregated industry %s: avg_pe=%s, avg_rg=%s, sum_rev=%s",
-                industry,
-                avg_pe,
-                avg_rg,
-                sum_rev,
+        # History rows: copy exactly the snapshot rows written above
+        self.db.execute(
+            insert(IndustryStatsHistory).from_select(
+                ["industry", "avg_pe_ratio", "avg_revenue_growth", "sum_revenue", "created_at"],
+                select(
+                    IndustryStats.industry,
+                    IndustryStats.avg_pe_ratio,
+                    IndustryStats.avg_revenue_growth,
+                    IndustryStats.sum_revenue,
+                    IndustryStats.calculated_at,
+                ).where(IndustryStats.calculated_at == now),
             )
-
+        )
         self.db.commit()
-        logger.info("Industry aggregation completed.")
+        logger.info("Industry aggregation completed (%d industries).", result.rowcount)
@@ -7,12 +7,16 @@ It:
 - prints a short summary of the debug response
 """
 import logging
-from typing import List
-from src.api_client import FiindoAPI
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+from src.api_client import get_shared_api
 from src.models import SessionLocal, Ticker, TickerStats
 
 logger = logging.getLogger(__name__)
 
+# Concurrent /debug requests (bounded to stay within the API rate limits)
+MAX_DEBUG_WORKERS = 16
+
 def find_tickers_without_stats() -> List[str]:
     """Return all symbols that have no row in TickerStats."""
     session = SessionLocal()
@@ -27,25 +31,46 @@ def find_tickers_without_stats() -> List[str]:
     finally:
         session.close()
 
+def print_summary(symbol: str, data: Optional[Dict[str, Any]]) -> None:
+    """Print a short summary of one /debug response."""
+    if not data:
+        print(f"{symbol}: no debug data (None or 404)")
+        return
+
+    top_keys = list(data.keys())
+    print(f"{symbol}: debug response keys = {top_keys}")
+
+    # Show validation-related fields if present
+    is_valid = data.get("is_valid")
+    message = data.get("message")
+    if is_valid is not None or message is not None:
+        print(f"  - is_valid={is_valid}, message={message}")
+    print()
+
 def debug_tickers(symbols: List[str]) -> None:
-    """Call /debug/{symbol} for each symbol and print a short summary."""
-    api = FiindoAPI()
-    for symbol in symbols:
+    """
+    Call /debug/{symbol} for each symbol (in parallel, up to
+    MAX_DEBUG_WORKERS at a time) and print a short summary as
+    responses arrive.
+    """
+    api = get_shared_api(min_pool_size=MAX_DEBUG_WORKERS)
+
+    def fetch(symbol: str) -> Optional[Dict[str, Any]]:
         logger.info("Requesting /debug for %s ...", symbol)
-        data = api.get_debug(symbol)
-        if not data:
-            print(f"{symbol}: no debug data (None or 404)")
-            continue
-
-        top_keys = list(data.keys())
-        print(f"{symbol}: debug response keys = {top_keys}")
-
-        # Show validation-related fields if present
-        is_valid = data.get("is_valid")
-        message = data.get("message")
-        if is_valid is not None or message is not None:
-            print(f"  - is_valid={is_valid}, message={message}")
-        print()
+        return api.get_debug(symbol)
+
+    with ThreadPoolExecutor(max_workers=MAX_DEBUG_WORKERS) as executor:
+        futures = {executor.submit(fetch, s): s for s in symbols}
+        for fut in as_completed(futures):
+            symbol = futures[fut]
+            try:
+                data = fut.result()
+            except Exception as exc:
+                logger.exception("Error while requesting /debug for %s: %s", symbol, exc)
+                print(f"{symbol}: request failed ({exc})")
+                print()
+                continue
+            print_summary(symbol, data)
 
 def main() -> None:
     # Simple console logging for this helper (no file-based ETL logging)
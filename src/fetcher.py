@@ -10,15 +10,16 @@ import logging
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-from src.api_client import FiindoAPI
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from src.api_client import get_shared_api
 from src.models import SessionLocal, Ticker
 
 logger = logging.getLogger(__name__)
-TARGET_INDUSTRIES = {
+TARGET_INDUSTRIES = frozenset({
     "Banks - Diversified",
     "Software - Application",
     "Consumer Electronics",
-}
+})
 
 def _int_from_env(env_name: str, default: int) -> int:
     """Helper: read an int from environment with a safe fallback."""
@@ -35,6 +36,13 @@ def _int_from_env(env_name: str, default: int) -> int:
 DEFAULT_FETCH_WORKERS = 5
 MAX_FETCH_WORKERS = _int_from_env("MAX_FETCH_WORKERS", DEFAULT_FETCH_WORKERS)
 
+# Ask /symbols to pre-filter by industry (undocumented, off by default).
+# /general is still checked for every returned symbol, so a server that
+# ignores the parameter only costs the usual full funnel.
+SERVER_SIDE_INDUSTRY_FILTER = os.getenv(
+    "FIINDO_SERVER_SIDE_INDUSTRY_FILTER", "false"
+).lower() in {"1", "true", "yes"}
+
 
 class SymbolFetcher:
     """
@@ -43,8 +51,9 @@ class SymbolFetcher:
     """
 
     def __init__(self) -> None:
-        # This API client is only used for the /symbols call
-        self.api = FiindoAPI()
+        # Shared API client (one pooled requests.Session) used by the
+        # /symbols call and all /general worker threads
+        self.api = get_shared_api(min_pool_size=MAX_FETCH_WORKERS)
         self.db = SessionLocal()
 
     def fetch_and_filter_symbols(self) -> List[Dict]:
@@ -53,7 +62,7 @@ class SymbolFetcher:
         return only those belonging to the target industries.
         Also persists basic ticker metadata in the database.
         """
-        symbols = self.api.get_symbols()
+        symbols = self._get_candidate_symbols()
         logger.info("Fetched %d symbols from /symbols", len(symbols))
 
         if not symbols:
@@ -62,29 +71,24 @@ class SymbolFetcher:
         def process_symbol(symbol: str) -> Optional[Dict]:
             """Worker function to fetch /general for a single symbol."""
             try:
-                api = FiindoAPI()
-                general = api.get_general(symbol)
+                general = self.api.get_general(symbol)
                 if not general:
                     return None
 
-                fundamentals = general.get("fundamentals", {})
-                profile_list = fundamentals.get("profile", {}).get("data", [])
-                if not profile_list:
+                try:
+                    info = general["fundamentals"]["profile"]["data"][0]
+                    industry = info["industry"]
+                except (KeyError, IndexError, TypeError):
                     return None
 
-                info = profile_list[0]
-                industry = info.get("industry")
-                company = info.get("companyName")
-                exchange = info.get("exchange")
-
                 if industry not in TARGET_INDUSTRIES:
                     return None
-                logger.info("Symbol %s is relevant (industry=%s)", symbol, industry)
+                logger.debug("Symbol %s is relevant (industry=%s)", symbol, industry)
                 return {
                     "symbol": symbol,
-                    "company": company,
+                    "company": info.get("companyName"),
                     "industry": industry,
-                    "exchange": exchange,
+                    "exchange": info.get("exchange"),
                 }
             except Exception as exc:
                 logger.exception("Error while processing /general for %s: %s", symbol, exc)
@@ -102,39 +106,55 @@ class SymbolFetcher:
                 res = fut.result()
                 if res:
                     valid.append(res)
-        logger.info("Found %d relevant symbols after industry filter", len(valid))
-
-        # Persist ticker master data (single DB session, serial writes)
-        for entry in valid:
-            self._store_ticker(
-                entry["symbol"],
-                entry["company"],
-                entry["industry"],
-                entry["exchange"],
-            )
+        logger.info(
+            "Filtered %d/%d symbols into target industries", len(valid), len(symbols)
+        )
 
-        self.db.commit()
+        self._store_tickers(valid)
         return valid
 
-    def _store_ticker(self, symbol: str, company: str, industry: str, exchange: str) -> None:
-        """Insert ticker master data if it does not exist yet."""
-        existing = (
-            self.db.query(Ticker)
-            .filter(Ticker.symbol == symbol)
-            .one_or_none()
-        )
+    def _get_candidate_symbols(self) -> List[str]:
+        """
+        Symbols to check via /general: the server-side filtered list if
+        enabled and non-empty, otherwise the full /symbols universe.
+        """
+        if SERVER_SIDE_INDUSTRY_FILTER:
+            symbols = self.api.get_symbols(industries=TARGET_INDUSTRIES)
+            if symbols:
+                return symbols
+            logger.warning(
+                "Server-side industry filter returned no symbols, "
+                "falling back to the full /symbols list"
+            )
+        return self.api.get_symbols()
 
-        if existing:
+    def _store_tickers(self, entries: List[Dict]) -> None:
+        """
+        Insert ticker master data for all symbols that do not exist yet.
+        A single multi-row INSERT OR IGNORE: the UNIQUE index on symbol
+        does the existence check during the insert, no SELECT needed.
+        """
+        if not entries:
             return
 
-        t = Ticker(
-            symbol=symbol,
-            company=company,
-            industry=industry,
-            exchange=exchange,
+        # Deduplicate by symbol (last entry wins)
+        rows = list(
+            {
+                e["symbol"]: {
+                    "symbol": e["symbol"],
+                    "company": e["company"],
+                    "industry": e["industry"],
+                    "exchange": e["exchange"],
+                }
+                for e in entries
+            }.values()
+        )
+        stmt = sqlite_insert(Ticker.__table__).on_conflict_do_nothing(index_elements=["symbol"])
+        result = self.db.execute(stmt, rows)
+        self.db.commit()
+        logger.info(
+            "Inserted %d new ticker(s) out of %d relevant symbols", result.rowcount, len(rows)
         )
-        self.db.add(t)
-        logger.info("Inserted new ticker: %s (%s)", symbol, industry)
 
 if __name__ == "__main__":
     from src.logging_setup import setup_logging
@@ -1,17 +1,42 @@
 """
 Central logging configuration for the ETL pipeline.
 - Writes structured logs to logs/etl.log
+- File writes happen on a background listener thread (QueueHandler /
+  QueueListener), so worker threads never block on disk I/O
 """
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 from datetime import datetime
+from typing import Optional
 
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
 
-# Timestamped log file: logs/etl_20250206_214501.log
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-LOG_FILE = os.path.join(LOG_DIR, f"etl_{timestamp}.log")
+# Timestamped log file of the current run (logs/etl_20250206_214501.log),
+# chosen by setup_logging(): importing this module never touches the disk
+_log_file: Optional[str] = None
+
+# Background thread draining the log queue into the file handler
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_listener() -> None:
+    """Flush queued records and stop the listener thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener.handlers[0].close()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
+def get_log_file() -> Optional[str]:
+    """Path of the log file written by this process (None before setup_logging())."""
+    return _log_file
 
 
 def setup_logging(file_level: int = logging.INFO) -> None:
@@ -27,9 +52,16 @@ def setup_logging(file_level: int = logging.INFO) -> None:
     # Prevent duplicate log handlers in repeated calls
     if root.handlers:
         root.handlers.clear()
+    _stop_listener()
+
+    # Log file named after the actual ETL start time
+    global _log_file
+    os.makedirs(LOG_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    _log_file = os.path.join(LOG_DIR, f"etl_{timestamp}.log")
 
     # FILE HANDLER (detailed logging: INFO, WARNING, ERROR)
-    file_handler = logging.FileHandler(LOG_FILE, encoding="utf-8")
+    file_handler = logging.FileHandler(_log_file, encoding="utf-8")
     file_handler.setLevel(file_level)
     file_formatter = logging.Formatter(
         "%(asctime)s [%(levelname)s] %(name)s - %(message)s"
@@ -44,12 +76,23 @@ def setup_logging(file_level: int = logging.INFO) -> None:
     )
     console_handler.setFormatter(console_formatter)
 
-    # Register handlers
-    root.addHandler(file_handler)
+    # FILE HANDLER runs behind a queue: callers only enqueue the record,
+    # the listener thread does the actual write
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(file_level)  # drop filtered records before enqueuing
+    global _listener
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    # Register handlers (console stays direct: low volume at WARNING)
+    root.addHandler(queue_handler)
     root.addHandler(console_handler)
 
     # Visible in console because it's WARNING level
-    root.warning("Logging to file: %s", LOG_FILE)
+    root.warning("Logging to file: %s", _log_file)
 
 
 
@@ -4,16 +4,19 @@ High-level steps:
 1) Enable optional speed boost
 2) Fetch and filter symbols for the three target industries
 3) Compute ticker-level metrics in parallel
-4) Persist metrics to SQLite
+4) Persist metrics to SQLite (concurrently with step 3, in batches)
 5) Aggregate industry-level metrics
 """
 import logging
 import os
+import queue
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from dotenv import load_dotenv
 from src.fetcher import SymbolFetcher
-from src.calculations import Calculator
+from src.calculations import Calculator, REQUESTS_PER_SYMBOL
 from src.db_writer import DBWriter
 from src.logging_setup import setup_logging
 from src.api_client import enable_speedboost
@@ -38,6 +41,85 @@ def _int_from_env(env_name: str, default: int) -> int:
 # Number of worker threads used for calculations
 MAX_WORKERS = _int_from_env("MAX_WORKERS", DEFAULT_MAX_WORKERS)
 
+# Number of ticker results written per bulk insert
+DEFAULT_DB_BATCH_SIZE = 64
+DB_BATCH_SIZE = _int_from_env("DB_BATCH_SIZE", DEFAULT_DB_BATCH_SIZE)
+
+# Max seconds a calculated result waits in the queue before being written
+DB_FLUSH_INTERVAL_SECONDS = 0.5
+
+
+class TickerStatsConsumer:
+    """
+    Background DB writer for step 4.
+    Calculation results are put() on a queue as they complete; a single
+    thread drains it and writes batches of up to batch_size items (or
+    whatever arrived within flush_interval) via save_ticker_stats_bulk.
+    Every batch is committed on its own, so no write transaction stays
+    open during the network-bound calculations and results already
+    written survive a later failure. The writer's session is only used
+    by this thread until close() has returned.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        writer: DBWriter,
+        batch_size: int = DB_BATCH_SIZE,
+        flush_interval: float = DB_FLUSH_INTERVAL_SECONDS,
+    ) -> None:
+        self.writer = writer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.saved = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def put(self, symbol: str, stats: Dict) -> None:
+        self._queue.put((symbol, stats))
+
+    def close(self) -> int:
+        """Flush remaining items, stop the thread and return the number of saved rows."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self.saved
+
+    def _run(self) -> None:
+        batch: List[Tuple[str, Dict]] = []
+        deadline = None
+        stopping = False
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is self._STOP:
+                stopping = True
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            if batch and (stopping or due or len(batch) >= self.batch_size):
+                try:
+                    self.saved += self.writer.save_ticker_stats_bulk(batch)
+                except BaseException as exc:
+                    logger.exception("Failed to persist a batch of ticker metrics: %s", exc)
+                    self._error = exc
+                    return
+                batch = []
+                deadline = None
+
 
 def run_etl() -> None:
     """
@@ -50,91 +132,112 @@ def run_etl() -> None:
 
     logger.warning("Initializing ETL run...")
 
+    fetcher = SymbolFetcher()
+    writer = DBWriter()
+
     # Step 0: Optional Speed Boost activation
-    enable_speedboost()
+    # (reuses the fetcher's API session, which the /symbols call uses next)
+    enable_speedboost(fetcher.api)
 
     logger.warning("STARTING ETL PIPELINE")
 
-    fetcher = SymbolFetcher()
-    writer = DBWriter()
-
     # Step 1: Clear current snapshot tables
     logger.warning("Step 1: Clearing current snapshot tables...")
     writer.clear_current_tables()
     logger.warning("Step 1 completed.")
 
-    # Step 2: Fetch & filter symbols
-    logger.warning("Step 2: Fetching and filtering symbols...")
-    symbols: List[Dict] = fetcher.fetch_and_filter_symbols()
-    logger.warning("Step 2 completed: %d symbols match the target industries.", len(symbols))
-
-    if not symbols:
-        logger.error("No relevant symbols found — aborting ETL run.")
-        logger.warning("ETL PIPELINE ABORTED.")
-        return
-
-    # Step 3: Parallel calculations
-    logger.warning(
-        "Step 3: Starting calculations for %d symbols using up to %d worker threads...",
-        len(symbols),
-        MAX_WORKERS,
-    )
-
-    def process_symbol(entry: Dict) -> Tuple[str, Dict]:
-        """Worker function executed by each thread."""
-        symbol = entry["symbol"]
-        calculator = Calculator()
-        stats = calculator.calculate_all(symbol)
-        return symbol, stats
-
-    futures = []
-    results: List[Tuple[str, Dict]] = []
-
-    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        for entry in symbols:
-            futures.append(executor.submit(process_symbol, entry))
-
-        for fut in as_completed(futures):
-            try:
-                symbol, stats = fut.result()
-            except Exception as exc:
-                logger.exception("Error while calculating stats for a symbol: %s", exc)
-                continue
-
-            if not stats:
-                logger.warning("No metrics could be calculated for %s", symbol)
-                continue
-
-            results.append((symbol, stats))
-
-    logger.warning(
-        "Step 3 completed: %d/%d tickers calculated successfully.",
-        len(results),
-        len(symbols),
-    )
-
-    if not results:
-        logger.error("No metrics successfully calculated — aborting.")
-        logger.warning("ETL PIPELINE ABORTED.")
-        return
-
-    # Step 4: Persist calculations
-    logger.warning("Step 4: Persisting ticker metrics to SQLite...")
-    for symbol, stats in results:
-        writer.save_ticker_stats(symbol, stats)
-    logger.warning("Step 4 completed: %d rows saved.", len(results))
-
-    # Step 5: Industry aggregation
-    logger.warning("Step 5: Aggregating industry-level metrics...")
-    writer.aggregate_industries()
-    logger.warning("Step 5 completed.")
-
-    # FINISHED
-    logger.warning(
-        "ETL PIPELINE COMPLETED (symbols=%d, successful calculations=%d)",
-        len(symbols),
-        len(results),
-    )
+    # Everything after step 1 runs inside try/finally: with
+    # FIINDO_DEFER_INDEXES the snapshot indexes are dropped in step 1 and
+    # must come back even if the run aborts or fails.
+    try:
+        # Step 2: Fetch & filter symbols
+        logger.warning("Step 2: Fetching and filtering symbols...")
+        symbols: List[Dict] = fetcher.fetch_and_filter_symbols()
+        logger.warning("Step 2 completed: %d symbols match the target industries.", len(symbols))
+
+        if not symbols:
+            logger.error("No relevant symbols found — aborting ETL run.")
+            logger.warning("ETL PIPELINE ABORTED.")
+            return
+
+        # Step 3: Parallel calculations
+        # Step 4 runs alongside: results are handed to a background DB writer
+        # as soon as they are calculated.
+        logger.warning(
+            "Step 3: Starting calculations for %d symbols using up to %d worker threads...",
+            len(symbols),
+            MAX_WORKERS,
+        )
+        logger.warning("Step 4: Persisting ticker metrics to SQLite as they complete...")
+
+        # One shared Calculator: each symbol worker fans out its three API calls
+        # onto the calculator's own pool, so size it for all symbol workers.
+        calculator = Calculator(max_workers=MAX_WORKERS * REQUESTS_PER_SYMBOL)
+        consumer = TickerStatsConsumer(writer)
+        consumer.start()
+
+        def process_symbol(entry: Dict) -> Tuple[str, Dict]:
+            """Worker function executed by each thread."""
+            symbol = entry["symbol"]
+            stats = calculator.calculate_all(symbol)
+            return symbol, stats
+
+        futures = []
+        calculated = 0
+
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+                for entry in symbols:
+                    futures.append(executor.submit(process_symbol, entry))
+
+                for fut in as_completed(futures):
+                    try:
+                        symbol, stats = fut.result()
+                    except Exception as exc:
+                        logger.exception("Error while calculating stats for a symbol: %s", exc)
+                        continue
+
+                    if not stats:
+                        logger.warning("No metrics could be calculated for %s", symbol)
+                        continue
+
+                    consumer.put(symbol, stats)
+                    calculated += 1
+        finally:
+            calculator.close()
+            # Flush (and commit) the remaining results
+            saved = consumer.close()
+
+        logger.warning(
+            "Step 3 completed: %d/%d tickers calculated successfully.",
+            calculated,
+            len(symbols),
+        )
+
+        if not calculated:
+            logger.error("No metrics successfully calculated — aborting.")
+            logger.warning("ETL PIPELINE ABORTED.")
+            return
+
+        logger.warning("Step 4 completed: %d rows saved.", saved)
+
+        # Step 5: Industry aggregation
+        logger.warning("Step 5: Aggregating industry-level metrics...")
+        writer.aggregate_industries()
+        logger.warning("Step 5 completed.")
+
+        # FINISHED
+        logger.warning(
+            "ETL PIPELINE COMPLETED (symbols=%d, successful calculations=%d)",
+            len(symbols),
+            calculated,
+        )
+    except BaseException:
+        # Discard a half-written aggregation of the failed run
+        writer.db.rollback()
+        raise
+    finally:
+        writer.restore_indexes()
 
 
 if __name__ == "__main__":
@@ -16,7 +16,9 @@ from sqlalchemy import (
     Float,
     DateTime,
     ForeignKey,
+    Index,
     create_engine,
+    event,
 )
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 
@@ -30,6 +32,31 @@ engine = create_engine(
     connect_args={"check_same_thread": False},  # needed for SQLite in some envs
 )
 
+# SQLite tuning applied to every new DB-API connection:
+# - WAL journal: commits append to the log instead of rewriting pages,
+#   and readers do not block the ETL writer
+# - synchronous=NORMAL: safe with WAL, avoids an fsync per commit
+# - 64 MiB page cache, temp tables/indices in memory
+# - reads via a 256 MiB memory map instead of read() syscalls
+# - wait up to 5s for a lock instead of failing with "database is locked"
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "cache_size=-65536",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "busy_timeout=5000",
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 class Ticker(Base):
@@ -44,9 +71,11 @@ class Ticker(Base):
     company = Column(String, nullable=True)
     industry = Column(String, index=True, nullable=True)
     exchange = Column(String, nullable=True)
-    stats = relationship("TickerStats", back_populates="ticker", lazy="select")
+    # lazy="raise": accidental per-row lazy loads (N+1) fail loudly;
+    # load explicitly, e.g. .options(selectinload(Ticker.stats))
+    stats = relationship("TickerStats", back_populates="ticker", lazy="raise")
     stats_history = relationship(
-        "TickerStatsHistory", back_populates="ticker", lazy="select"
+        "TickerStatsHistory", back_populates="ticker", lazy="raise"
     )
 
 class TickerStats(Base):
@@ -62,14 +91,27 @@ class TickerStats(Base):
     """
     __tablename__ = "ticker_stats"
     id = Column(Integer, primary_key=True, index=True)
-    ticker_id = Column(Integer, ForeignKey("tickers.id"), index=True, nullable=False)
+    # Indexed through ix_ticker_stats_cover (ticker_id is its leading column)
+    ticker_id = Column(Integer, ForeignKey("tickers.id"), nullable=False)
     pe_ratio = Column(Float)
     revenue_growth = Column(Float)
     net_income_ttm = Column(Float)
     debt_ratio = Column(Float)
     latest_revenue = Column(Float)
     calculated_at = Column(DateTime, default=datetime.utcnow)
-    ticker = relationship("Ticker", back_populates="stats")
+    ticker = relationship("Ticker", back_populates="stats", lazy="raise")
+
+    __table_args__ = (
+        # Covering index for the industry aggregation (join on ticker_id,
+        # AVG/SUM over the metrics) so it never has to touch the table rows
+        Index(
+            "ix_ticker_stats_cover",
+            "ticker_id",
+            "pe_ratio",
+            "revenue_growth",
+            "latest_revenue",
+        ),
+    )
 
 class TickerStatsHistory(Base):
     """
@@ -85,8 +127,8 @@ class TickerStatsHistory(Base):
     net_income_ttm = Column(Float)
     debt_ratio = Column(Float)
     latest_revenue = Column(Float)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    ticker = relationship("Ticker", back_populates="stats_history")
+    created_at = Column(DateTime, index=True, default=datetime.utcnow)
+    ticker = relationship("Ticker", back_populates="stats_history", lazy="raise")
 
 class IndustryStats(Base):
     """
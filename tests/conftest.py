@@ -7,9 +7,29 @@ modules under `src/` can be imported in tests like:
 import os
 import sys
 
+import pytest
+
 # Determine the project root (one level above /tests)
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 # Add the root directory to sys.path so that "import src.xxx" works in tests
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
+
+# Tests never talk to the real API: keep the on-disk HTTP cache disabled
+# so that importing the client does not create a cache file.
+os.environ.setdefault("FIINDO_HTTP_CACHE", "false")
+
+
+@pytest.fixture
+def test_session_local():
+    """
+    Create an in-memory SQLite DB and return a SessionLocal bound to it.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src import models
+
+    engine = create_engine("sqlite:///:memory:", echo=False)
+    models.Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,130 @@
+import json
+import os
+import pytest
+import src.analyze_logs as analyze_logs
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """Point analyze_logs at an empty temporary logs/ directory."""
+    monkeypatch.setattr(analyze_logs, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(analyze_logs, "FALLBACK_LOG_FILE", str(tmp_path / "etl.log"))
+    monkeypatch.setattr(analyze_logs, "STATE_FILE", str(tmp_path / ".analyze_logs.state"))
+    return tmp_path
+
+
+def write_log(log_dir, text, name="etl_20250101_000000.log", mode="w"):
+    with open(os.path.join(log_dir, name), mode, encoding="utf-8") as f:
+        f.write(text)
+
+
+def run(capsys, **kwargs):
+    """Run analyze_logs and return its printed summary."""
+    analyze_logs.analyze_logs(**kwargs)
+    return capsys.readouterr().out
+
+
+def test_full_rescan_counts_unterminated_last_line_once(log_dir, capsys):
+    """
+    A full rescan reports a last line without trailing newline, but keeps
+    the saved position in front of it: once the line is complete, the next
+    incremental run reports it in full and counts it only once.
+    """
+    write_log(log_dir, "a [ERROR] x - Server Error: 500\nb [ERROR] y - Server Error: 503")
+
+    out = run(capsys, incremental=False)
+    assert "2 errors detected." in out
+    assert "503: 1 occurrence(s)" in out
+
+    write_log(log_dir, " more\n", mode="a")
+    out = run(capsys)
+    assert "2 errors detected." in out
+    assert "b [ERROR] y - Server Error: 503 more" in out
+    assert "503: 1 occurrence(s)" in out
+
+
+def test_each_pattern_counts_its_first_match_per_line(log_dir, capsys):
+    """
+    Like the original per-line scan, every pattern counts at most once per
+    line: a repeated URL path is one event, and the no-metrics symbol does
+    not hide a URL that directly follows it.
+    """
+    url = "https://api/financials/AAA/income_statement"
+    write_log(
+        log_dir,
+        f"x [ERROR] src.api_client - Unexpected status 500 from {url}: {url}\n"
+        "y [ERROR] src.main - No metrics could be calculated for "
+        "CCC/financials/BBB/income_statement\n",
+    )
+
+    out = run(capsys, incremental=False)
+    assert "500: 1 occurrence(s)" in out
+    assert "AAA: 1 time(s) with no metrics" in out
+    assert "BBB: 1 time(s) with no metrics" in out
+
+
+def test_incremental_run_resumes_after_appended_lines(log_dir, capsys):
+    """
+    The second run only scans what was appended and merges it with the
+    remembered results of the first run.
+    """
+    write_log(log_dir, "a [ERROR] x - Server Error: 500\n")
+    run(capsys)
+
+    with open(analyze_logs.STATE_FILE, encoding="utf-8") as f:
+        first_offset = json.load(f)["offset"]
+    write_log(
+        log_dir,
+        "b [WARNING] y - No metrics could be calculated for AAA\n"
+        "c [ERROR] z - Server Error: 500\n",
+        mode="a",
+    )
+
+    out = run(capsys)
+    assert "2 errors detected." in out
+    assert "500: 2 occurrence(s)" in out
+    assert "AAA: 1 time(s) with no metrics" in out
+
+    with open(analyze_logs.STATE_FILE, encoding="utf-8") as f:
+        state = json.load(f)
+    log_file = os.path.join(log_dir, "etl_20250101_000000.log")
+    assert first_offset < state["offset"] == os.path.getsize(log_file)
+
+
+def test_incremental_run_rescans_shrunk_or_replaced_file(log_dir, capsys):
+    """A file shorter than the saved position is scanned from the start."""
+    write_log(log_dir, "a [ERROR] x - Server Error: 500\nb [ERROR] x - Server Error: 500\n")
+    run(capsys)
+
+    write_log(log_dir, "c [ERROR] y - Server Error: 503\n")
+    out = run(capsys)
+    assert "1 errors detected." in out
+    assert "503: 1 occurrence(s)" in out
+    assert "500:" not in out
+
+
+def test_incremental_run_starts_over_on_a_newer_log_file(log_dir, capsys):
+    """Results of a previous log file are not carried over to a newer one."""
+    write_log(log_dir, "a [ERROR] x - Server Error: 500\n")
+    run(capsys)
+
+    write_log(log_dir, "b [ERROR] y - Server Error: 503\n", name="etl_20250102_000000.log")
+    out = run(capsys)
+    assert "etl_20250102_000000.log" in out
+    assert "1 errors detected." in out
+    assert "503: 1 occurrence(s)" in out
+    assert "500:" not in out
+
+
+def test_incremental_run_reports_unterminated_last_line(log_dir, capsys):
+    """
+    The default mode reports a last line without trailing newline (like a
+    full scan), but does not remember it, so it is not counted twice.
+    """
+    write_log(log_dir, "a [ERROR] x - Server Error: 503")
+    assert "503: 1 occurrence(s)" in run(capsys)
+
+    write_log(log_dir, "\n", mode="a")
+    out = run(capsys)
+    assert "1 errors detected." in out
+    assert "503: 1 occurrence(s)" in out
@@ -0,0 +1,71 @@
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+import pytest
+import requests
+from src.api_client import FiindoAPI, _json_loads
+
+
+def test_json_loads_accepts_nan_and_infinity():
+    """
+    Payloads with NaN / Infinity tokens (rejected by orjson) still parse,
+    like they did with response.json().
+    """
+    data = _json_loads(b'{"pe": NaN, "growth": Infinity, "revenue": 1.5}')
+    assert math.isnan(data["pe"])
+    assert data["growth"] == math.inf
+    assert data["revenue"] == 1.5
+
+    with pytest.raises(ValueError):
+        _json_loads(b"{not json")
+
+
+def make_response(status_code, headers):
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers)
+    return response
+
+
+def test_server_retry_hint_delta_seconds():
+    assert FiindoAPI._server_retry_hint(make_response(429, {"Retry-After": "7"})) == 7.0
+    assert FiindoAPI._server_retry_hint(make_response(500, {"Retry-After": "-3"})) == 0.0
+    assert FiindoAPI._server_retry_hint(make_response(429, {})) is None
+
+
+def test_server_retry_hint_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=60)
+    hint = FiindoAPI._server_retry_hint(
+        make_response(429, {"Retry-After": format_datetime(when, usegmt=True)})
+    )
+    assert 55 <= hint <= 60
+
+    past = format_datetime(datetime(2000, 1, 1, tzinfo=timezone.utc), usegmt=True)
+    assert FiindoAPI._server_retry_hint(make_response(429, {"Retry-After": past})) == 0.0
+
+
+def test_server_retry_hint_rate_limit_reset():
+    # Delta seconds and absolute epoch timestamps, 429 only
+    assert FiindoAPI._server_retry_hint(
+        make_response(429, {"X-RateLimit-Reset": "12"})
+    ) == 12.0
+    hint = FiindoAPI._server_retry_hint(
+        make_response(429, {"X-RateLimit-Reset": str(int(time.time()) + 30)})
+    )
+    assert 25 <= hint <= 30
+    assert FiindoAPI._server_retry_hint(
+        make_response(500, {"X-RateLimit-Reset": "12"})
+    ) is None
+
+
+def test_server_retry_hint_rejects_non_finite_values():
+    for value in ("nan", "inf", "-inf"):
+        assert FiindoAPI._server_retry_hint(make_response(429, {"Retry-After": value})) is None
+        assert FiindoAPI._server_retry_hint(
+            make_response(429, {"X-RateLimit-Reset": value})
+        ) is None
+    # An unusable Retry-After does not hide X-RateLimit-Reset
+    assert FiindoAPI._server_retry_hint(
+        make_response(429, {"Retry-After": "nan", "X-RateLimit-Reset": "5"})
+    ) == 5.0
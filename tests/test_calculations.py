@@ -155,3 +155,29 @@ def test_calculator_returns_none_if_not_enough_quarters():
     calc.api = FakeApiTooShort()
     result = calc.calculate_all("TEST")
     assert result is None
+
+
+def test_calculator_sets_metric_to_none_on_missing_input():
+    """
+    A missing or non-numeric input should only null out the metrics that
+    depend on it; all other metrics are still computed.
+    """
+    class FakeApiMissingValues(FakeApi):
+        def get_financials(self, symbol: str, statement: str):
+            data = super().get_financials(symbol, statement)
+            if statement == "income_statement":
+                rows = data["fundamentals"]["financials"]["income_statement"]["data"]
+                rows[1]["revenue"] = None  # previous quarter revenue missing
+                rows[0]["eps"] = "n/a"  # latest EPS not numeric
+            return data
+
+    calc = Calculator()
+    calc.api = FakeApiMissingValues()
+    result = calc.calculate_all("TEST")
+    assert result is not None
+
+    assert result["revenue_growth"] is None
+    assert result["pe_ratio"] is None
+    assert result["net_income_ttm"] == pytest.approx(57.0)
+    assert result["debt_ratio"] == pytest.approx(2.0)
+    assert result["latest_revenue"] == pytest.approx(200.0)
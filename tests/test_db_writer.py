@@ -1,28 +1,16 @@
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import inspect
 from src import models
 import src.db_writer as db_writer
 
-def create_test_session():
-    """
-    Create an in-memory SQLite DB and return a SessionLocal bound to it.
-    """
-    engine = create_engine("sqlite:///:memory:", echo=False)
-    models.Base.metadata.create_all(bind=engine)
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return TestSessionLocal
-
-def test_aggregate_industries(monkeypatch):
+def test_aggregate_industries(monkeypatch, test_session_local):
     """
     Given a couple of tickers and ticker_stats rows,
     DBWriter.aggregate_industries should compute the expected aggregates.
     """
-    # 1) In-memory SessionLocal
-    TestSessionLocal = create_test_session()
-
+    # 1) In-memory SessionLocal (test_session_local fixture)
     # 2) Monkeypatch db_writer.SessionLocal so DBWriter uses our test DB
-    monkeypatch.setattr(db_writer, "SessionLocal", TestSessionLocal)
+    monkeypatch.setattr(db_writer, "SessionLocal", test_session_local)
 
     # 3) Create DBWriter + get session
     writer = db_writer.DBWriter()
@@ -77,3 +65,136 @@ def test_aggregate_industries(monkeypatch):
 
     # sum_revenue = 100 + 300 = 400
     assert row.sum_revenue == pytest.approx(400.0)
+
+
+def test_save_ticker_stats_bulk(monkeypatch, test_session_local):
+    """
+    DBWriter.save_ticker_stats_bulk should write one TickerStats and one
+    TickerStatsHistory row per known symbol and skip unknown symbols.
+    """
+    monkeypatch.setattr(db_writer, "SessionLocal", test_session_local)
+
+    writer = db_writer.DBWriter()
+    session = writer.db
+
+    t1 = models.Ticker(
+        symbol="AAA",
+        company="Company A",
+        industry="Banks - Diversified",
+        exchange="X",
+    )
+    t2 = models.Ticker(
+        symbol="BBB",
+        company="Company B",
+        industry="Banks - Diversified",
+        exchange="X",
+    )
+    session.add_all([t1, t2])
+    session.commit()
+
+    saved = writer.save_ticker_stats_bulk(
+        [
+            ("AAA", {"pe_ratio": 10.0, "revenue_growth": 0.1, "latest_revenue": 100.0}),
+            ("BBB", {"pe_ratio": 20.0, "debt_ratio": 2.0}),
+            ("UNKNOWN", {"pe_ratio": 30.0}),
+        ]
+    )
+    assert saved == 2
+
+    current = {s.ticker_id: s for s in session.query(models.TickerStats).all()}
+    assert set(current) == {t1.id, t2.id}
+    assert current[t1.id].pe_ratio == pytest.approx(10.0)
+    assert current[t1.id].latest_revenue == pytest.approx(100.0)
+    assert current[t2.id].debt_ratio == pytest.approx(2.0)
+    assert current[t2.id].revenue_growth is None
+
+    assert session.query(models.TickerStatsHistory).count() == 2
+
+
+def test_clear_current_tables_keeps_history(monkeypatch, test_session_local):
+    """
+    clear_current_tables should empty the snapshot tables and leave the
+    history tables untouched.
+    """
+    monkeypatch.setattr(db_writer, "SessionLocal", test_session_local)
+
+    writer = db_writer.DBWriter()
+    session = writer.db
+
+    t1 = models.Ticker(
+        symbol="AAA",
+        company="Company A",
+        industry="Banks - Diversified",
+        exchange="X",
+    )
+    session.add(t1)
+    session.commit()
+
+    writer.save_ticker_stats("AAA", {"pe_ratio": 10.0, "latest_revenue": 100.0})
+    writer.aggregate_industries()
+
+    writer.clear_current_tables()
+
+    assert session.query(models.TickerStats).count() == 0
+    assert session.query(models.IndustryStats).count() == 0
+    assert session.query(models.TickerStatsHistory).count() == 1
+    assert session.query(models.IndustryStatsHistory).count() == 1
+
+
+def test_deferred_indexes_are_rebuilt_for_aggregation(monkeypatch, test_session_local):
+    """
+    With FIINDO_DEFER_INDEXES, clear_current_tables drops the TickerStats
+    indexes; aggregate_industries (or restore_indexes after a failed run)
+    re-creates them.
+    """
+    monkeypatch.setattr(db_writer, "SessionLocal", test_session_local)
+    monkeypatch.setattr(db_writer, "DEFER_INDEXES", True)
+
+    writer = db_writer.DBWriter()
+    session = writer.db
+    expected = {index.name for index in models.TickerStats.__table__.indexes}
+
+    def ticker_stats_indexes():
+        return {
+            index["name"]
+            for index in inspect(session.connection()).get_indexes(
+                models.TickerStats.__tablename__
+            )
+        }
+
+    session.add(
+        models.Ticker(
+            symbol="AAA",
+            company="Company A",
+            industry="Banks - Diversified",
+            exchange="X",
+        )
+    )
+    session.commit()
+
+    writer.clear_current_tables()
+    assert ticker_stats_indexes().isdisjoint(expected)
+
+    writer.save_ticker_stats_bulk([("AAA", {"pe_ratio": 10.0})], commit=False)
+    writer.aggregate_industries()
+
+    assert ticker_stats_indexes() >= expected
+    assert session.query(models.IndustryStats).count() == 1
+
+    # A failed run (no aggregation) gets them back via restore_indexes()
+    writer.clear_current_tables()
+    session.rollback()
+    writer.restore_indexes()
+    assert ticker_stats_indexes() >= expected
+
+    # An index the schema does not have (e.g. migration not applied yet)
+    # is never created by the ETL
+    cover = next(
+        index for index in models.TickerStats.__table__.indexes
+        if index.name == "ix_ticker_stats_cover"
+    )
+    cover.drop(bind=session.connection())
+    session.commit()
+    writer.clear_current_tables()
+    writer.restore_indexes()
+    assert ticker_stats_indexes() == expected - {"ix_ticker_stats_cover"}
@@ -0,0 +1,87 @@
+from src import models
+import src.fetcher as fetcher
+
+
+class FakeApi:
+    """
+    Minimal fake Fiindo API for testing SymbolFetcher.
+    Three symbols, two of them in a target industry.
+    """
+
+    GENERAL = {
+        "AAA": ("Company A", "Banks - Diversified", "X"),
+        "BBB": ("Company B", "Consumer Electronics", "Y"),
+        "CCC": ("Company C", "Oil & Gas", "Z"),
+    }
+
+    def get_symbols(self, industries=None):
+        symbols = list(self.GENERAL) + ["MISSING"]
+        if industries:
+            return [
+                s for s in symbols
+                if s in self.GENERAL and self.GENERAL[s][1] in industries
+            ]
+        return symbols
+
+    def get_general(self, symbol: str):
+        if symbol not in self.GENERAL:
+            return None
+        company, industry, exchange = self.GENERAL[symbol]
+        return {
+            "fundamentals": {
+                "profile": {
+                    "data": [
+                        {
+                            "companyName": company,
+                            "industry": industry,
+                            "exchange": exchange,
+                        }
+                    ]
+                }
+            }
+        }
+
+
+def test_fetch_and_filter_symbols(monkeypatch, test_session_local):
+    """
+    SymbolFetcher should keep only symbols from the target industries
+    and store each of them exactly once in the Ticker table, also when
+    it runs again.
+    """
+    monkeypatch.setattr(fetcher, "SessionLocal", test_session_local)
+
+    symbol_fetcher = fetcher.SymbolFetcher()
+    symbol_fetcher.api = FakeApi()
+
+    valid = symbol_fetcher.fetch_and_filter_symbols()
+    assert sorted(e["symbol"] for e in valid) == ["AAA", "BBB"]
+
+    # Second run must not create duplicates
+    symbol_fetcher.fetch_and_filter_symbols()
+
+    session = symbol_fetcher.db
+    tickers = session.query(models.Ticker).order_by(models.Ticker.symbol).all()
+    assert [t.symbol for t in tickers] == ["AAA", "BBB"]
+    assert tickers[0].company == "Company A"
+    assert tickers[0].industry == "Banks - Diversified"
+    assert tickers[1].exchange == "Y"
+
+
+def test_server_side_industry_filter(monkeypatch, test_session_local):
+    """
+    With the server-side filter enabled, only the pre-filtered symbols are
+    checked via /general; an empty filtered list falls back to all symbols.
+    """
+    monkeypatch.setattr(fetcher, "SessionLocal", test_session_local)
+    monkeypatch.setattr(fetcher, "SERVER_SIDE_INDUSTRY_FILTER", True)
+
+    symbol_fetcher = fetcher.SymbolFetcher()
+    api = FakeApi()
+    symbol_fetcher.api = api
+    assert sorted(symbol_fetcher._get_candidate_symbols()) == ["AAA", "BBB"]
+
+    monkeypatch.setattr(
+        api, "get_symbols", lambda industries=None: [] if industries else ["AAA", "CCC"]
+    )
+    valid = symbol_fetcher.fetch_and_filter_symbols()
+    assert [e["symbol"] for e in valid] == ["AAA"]
@@ -0,0 +1,84 @@
+import time
+import pytest
+from src.main import TickerStatsConsumer
+
+
+class FakeWriter:
+    """Records the batches TickerStatsConsumer hands to save_ticker_stats_bulk."""
+
+    def __init__(self, error=None):
+        self.batches = []
+        self.error = error
+
+    def save_ticker_stats_bulk(self, results, commit=True):
+        if self.error is not None:
+            raise self.error
+        self.batches.append((list(results), commit))
+        return len(results)
+
+
+def wait_for(condition, timeout=2.0):
+    """Poll condition() until it is true or timeout seconds have passed."""
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_consumer_flushes_full_batches():
+    """
+    A batch is written (and committed) as soon as batch_size items arrived,
+    without waiting for the flush interval.
+    """
+    writer = FakeWriter()
+    consumer = TickerStatsConsumer(writer, batch_size=2, flush_interval=60)
+    consumer.start()
+
+    consumer.put("AAA", {"pe_ratio": 1.0})
+    consumer.put("BBB", {"pe_ratio": 2.0})
+    assert wait_for(lambda: writer.batches)
+    assert writer.batches == [
+        ([("AAA", {"pe_ratio": 1.0}), ("BBB", {"pe_ratio": 2.0})], True)
+    ]
+
+    assert consumer.close() == 2
+
+
+def test_consumer_flushes_after_interval():
+    """A partial batch is written once flush_interval has passed."""
+    writer = FakeWriter()
+    consumer = TickerStatsConsumer(writer, batch_size=100, flush_interval=0.05)
+    consumer.start()
+
+    consumer.put("AAA", {"pe_ratio": 1.0})
+    assert wait_for(lambda: writer.batches)
+    assert writer.batches[0][0] == [("AAA", {"pe_ratio": 1.0})]
+
+    assert consumer.close() == 1
+
+
+def test_consumer_close_flushes_last_batch():
+    """close() writes the remaining items and returns the number of saved rows."""
+    writer = FakeWriter()
+    consumer = TickerStatsConsumer(writer, batch_size=100, flush_interval=60)
+    consumer.start()
+
+    consumer.put("AAA", {"pe_ratio": 1.0})
+    consumer.put("BBB", {"pe_ratio": 2.0})
+    assert writer.batches == []
+
+    assert consumer.close() == 2
+    assert [symbol for symbol, _ in writer.batches[0][0]] == ["AAA", "BBB"]
+
+
+def test_consumer_close_reraises_writer_error():
+    """An exception raised while writing a batch is re-raised by close()."""
+    writer = FakeWriter(error=RuntimeError("disk full"))
+    consumer = TickerStatsConsumer(writer, batch_size=1, flush_interval=60)
+    consumer.start()
+
+    consumer.put("AAA", {"pe_ratio": 1.0})
+    with pytest.raises(RuntimeError, match="disk full"):
+        consumer.close()